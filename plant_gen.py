@@ -51,87 +51,110 @@ derivations     = 0
 operations      = 0
 random_max      = 20
 
-states          = []
-rules           = []
-operator_tokens = ['[',']','&','^','/','\\','!','+','-','F','L','K']
-curve           = None
-plant           = None
+rules           = {} # Rules by identifier
+operator_tokens = frozenset(['[',']','&','^','/','\\','!','+','-','F','L','K'])
 
 
 
+# Context
+# #######
+#
+# Everything needed while executing the operators of a plant: the state
+# stack, the curve & plant being drawn, the branches, leaves & flowers
+# collected so far, and a snapshot of the generator variables. This is
+# built once per plant and handed to each Operator, rather than each
+# Operator looking up globals
+#########################
+class _Ctx:
+	__slots__ = ('states', 'curve', 'step', 'radius', 'angle', 'plant',
+	             'draw_leaves', 'draw_flowers', 'print_drawing',
+	             'branches', 'leaf_verts', 'leaf_faces', 'flowers')
+
+	def __init__(self, curve, plant):
+		self.curve  = curve
+		self.plant  = plant
+		self.states = [State()]
+		self.step   = grow_step
+		self.radius = grow_radius
+		self.angle  = grow_angle
+
+		self.draw_leaves   = DRAW_LEAVES
+		self.draw_flowers  = DRAW_FLOWERS
+		self.print_drawing = PRINT_DRAWING
+
+		# Points of each finished branch, vertices & faces of every leaf
+		# (built into one mesh) and the position of each flower
+		self.branches   = []
+		self.leaf_verts = []
+		self.leaf_faces = []
+		self.flowers    = []
+
+
 # State
 # #####
 #
 # Current state of generator; branching involves pushing a copy of the 
 # current state onto the stack and working with that one, then popping
 # it off back to the previous state. State's store a position, 
-# orientation and spline which are useful for walking along and
-# creating the branch
+# orientation and the points of the branch which are useful for
+# walking along and creating the branch. The points are only drawn
+# into a spline (in one go) once the whole plant is finished
 #########################
 class State:
+	__slots__ = ('position', 'orientation', '_pending')
+
 	def __init__(self):
-		global curve
-		self.position    = (0.0, 0.0, 0.0, 1.0)
-		self.orientation = (90.0, 0.0, 00.0) # Facing upwards
-		self.spline = curve.splines.new(type='POLY')
+		self.position    = [0.0, 0.0, 0.0]
+		self.orientation = [90.0, 0.0, 00.0] # Facing upwards
+		self._pending = [] # (x, y, z, w, radius) of each point
 	def __repr__(self):
 		return "<State position {0}, orientation {1}>".format(self.position, self.orientation)
 
+	def add_point(self, radius):
+		position = self.position
+		self._pending.append((position[0], position[1], position[2], 1.0, radius))
+
+
 
 # Token
 # #####
 #
 # A single item (token) from a grammar in some rule of the L-system;
-# this could either be an Operator or another Rule. Executing a token
-# involves deriving it down into an array of Operators. For rules
+# this could either be an Operator or another Rule. Deriving a token
+# involves expanding it into the tokens of its matching rules. For rules
 # with a given probability of execution, the token puts this into
-# consideration before running the rule
+# consideration before expanding the rule
 ##########################
 class Token:
+	__slots__ = ('rule', 'param', '_is_op')
+
 	def __init__(self, rule, param):
 		self.rule  = rule
 		self.param = param
+		self._is_op = rule in operator_tokens
 		if PRINT_RULE:
 			print("<Token rule {0}, argument {1}>".format(self.rule, self.param))
 	def __repr__(self):
 		return "<Token rule {0}, parameter {1}>".format(self.rule, self.param)
 	def isOperator(self):
-		global operator_tokens
-		return self.rule in operator_tokens
+		return self._is_op
 
-	def execute(self,depth):
-		global rules, derivations, operations
-		global MIN_DERIVES, MAX_OPERATIONS, MAX_DEPTH
-
-		# Derive Token into all Operators
-		operators = []
-		if operations >= MAX_OPERATIONS:
-			if PRINT_LIMIT:
-				print("Max Operations: {0} >= {1}".format(str(operations), str(MAX_OPERATIONS)))
-			return operators
-		if depth > MAX_DEPTH:
-			if PRINT_LIMIT:
-				print("Max Depth: {0} >= {1}".format(str(depth), str(MAX_DEPTH)))
-			return operators
-
-		if self.isOperator():
-			operators.append(Operator(self.rule, self.param))
-			operations = operations + 1
-		else:
-			# Find matching rule
-			for rule in rules:
-				if rule.identifier == self.rule and (self.param == None or (self.param <= rule.arg_max and self.param >= rule.arg_min)):
-					if random.random() <= rule.probability or derivations < MIN_DERIVES:
+	def derive(self):
+		global rules, derivations
+		global MIN_DERIVES
 
-						if derivations < MIN_DERIVES:
-							derivations += 1
+		# Derive Token into the tokens of each matching rule
+		tokens = []
+		for rule in rules.get(self.rule, ()):
+			if self.param == None or (self.param <= rule.arg_max and self.param >= rule.arg_min):
+				if rule.probability >= 1 or random.random() <= rule.probability or derivations < MIN_DERIVES:
+
+					if derivations < MIN_DERIVES:
+						derivations += 1
 
-						# Derive operators for this rule
-						new_ops = rule.execute(self.param,depth+1)
-						for operator in new_ops:
-							operators.append(operator)
+					tokens.extend(rule.expand(self.param))
 
-		return operators
+		return tokens
 
 # Rule Tokenizer & Parser Details
 PARSER_RULE        = 1
@@ -139,18 +162,28 @@ PARSER_IDENTIFIER  = 2
 PARSER_ARGREQ      = 3
 PARSER_GRAMMAR     = 4
 
-GRAMMAR_IDENTIFIER = 1
-GRAMMAR_ARGUMENT   = 2
+# Character translations for splitting up an identifier, eg. L(t) -> L t,
+# and an argument requirement, eg. 1<t<8 -> 1 t 8
+_IDENTIFIER_TBL = str.maketrans("(", " ", ")")
+_ARGREQ_TBL     = str.maketrans("<>", "  ")
+
+# Grammar tokens: a single symbol/terminal, optionally followed by an
+# argument (eg. I20, I(20) or I(t+1))
+_TOKEN_RE = re.compile(r'([A-Za-z\[\]&^/\\!+\-])(?:\(([^)]+)\)|(\d+))?')
 
 # Rule
 # ####
 #
 # A Rule is a piece of the L-System generator which has a provided identifier,
-# argument requirement, probability, and grammar. When a Rule is executed, it
-# parses through its grammar with the provided (if any) argument, tokenizes
-# it, executes each token and then returns the array of operators
+# argument requirement, probability, and grammar. The grammar is tokenized
+# once, when the rule is parsed. When a Rule is expanded, it evaluates its
+# tokens with the provided (if any) argument and then returns the tokens.
+# Expanding a grammar without randomness is memoized per argument
 #############################
 class Rule:
+	__slots__ = ('rule', 'identifier', 'arg_name', 'arg_max', 'arg_min',
+	             'probability', 'grammar', '_tokens', '_deterministic', '_memo')
+
 	def __init__(self, description):
 		self.rule        = None
 		self.identifier  = None
@@ -185,7 +218,7 @@ class Rule:
 			elif parser == PARSER_IDENTIFIER:
 				# Parse Identifier & Arg
 				# 	L(t)
-				token_subtokens = token.replace("("," ").replace(")","").split(" ")
+				token_subtokens = token.translate(_IDENTIFIER_TBL).split(" ")
 				self.identifier = token_subtokens[0]
 				self.arg_name   = token_subtokens[1]
 			elif parser == PARSER_ARGREQ:
@@ -206,7 +239,7 @@ class Rule:
 					self.arg_min = int(token_subtokens[1])
 					self.arg_max = int(token_subtokens[1])
 					continue
-				token_subtokens = token.replace('<',' ').replace('>',' ').split(' ')
+				token_subtokens = token.translate(_ARGREQ_TBL).split(' ')
 				if len(token_subtokens) == 3:
 					self.arg_min = int(token_subtokens[0])+1
 					self.arg_max = int(token_subtokens[2])-1
@@ -230,59 +263,77 @@ class Rule:
 			if isinstance(self.arg_max, (int)) and isinstance(self.arg_min, (int)):
 				print("    Argument: {0} >= {1}, {0} <= {2}".format(self.arg_name,self.arg_min,self.arg_max))
 			print("    Grammar: {0}".format(self.grammar))
+
+		# Tokenize the grammar once up front; each token is stored as
+		# (symbol, argument, argument expression, uses random). Argument
+		# expressions are compiled into a function of the rule's argument and
+		# the random number (r)
+		# 	eg.  A(t+2)  ->  ('A', None, lambda t, r: t+2, False)
+		self._tokens = []
+		for match in _TOKEN_RE.finditer(self.grammar):
+			symbol   = match.group(1)
+			argument = match.group(2) or match.group(3)
+			if argument == None or argument.strip().isdigit():
+				if argument != None:
+					argument = int(argument)
+				self._tokens.append((symbol, argument, None, False))
+			else:
+				arg_func = eval("lambda {0}, r: {1}".format(self.arg_name or "_", argument))
+				self._tokens.append((symbol, None, arg_func, 'r' in argument))
+
+		# Grammars without a random (r) argument always expand the same way for
+		# a given argument, so their expansions can be memoized
+		self._deterministic = not any(token[3] for token in self._tokens)
+		self._memo          = {}
 	def __repr__(self):
 		return "<Rule [{0}](min {1}, max {2}): {3}".format(self.rule, self.arg_min, self.arg_max, self.grammar)
 
-	def execute(self, arg, depth):
+	def expand(self, arg):
 		global random_max
 
-		# Replace argument portions of the grammar with the provided argument
-		# 	eg.  A(t+2)  finds (t+2) and replaces 't' with the provided arg,
-		# 			evalutes (t+2) and replaces "t+2" with the evaluation
-		#
-		# Also replaces 'r' with a random number, to add a little randomness
-		# to the system
-		def replace_exec(match):
-			rand = random.random() * random_max
-			if random.random() < 0.5: # positive or negative?
-				rand *= -1
-			return "("+str(eval(match.group(1).replace(str(self.arg_name), str(arg)).replace('r', str(int(rand)))))+")"
+		if self._deterministic:
+			tokens = self._memo.get(arg)
+			if tokens != None:
+				return tokens
 
 		if PRINT_RULE_EXEC:
 			print("Executing Rule ({0}): {1}".format(arg, self.grammar))
-		exec_grammar = ""
-		if self.arg_name == None:
-			exec_grammar = self.grammar
-		else:
-			exec_grammar = re.sub(r'\(([^)]+)\)', replace_exec, self.grammar)
-		grammar_tokens = exec_grammar.replace("(","").replace(")","").replace(" ","")
-		if PRINT_RULE_EXEC:
-			print("Result: {0}".format(grammar_tokens))
-		parser = GRAMMAR_IDENTIFIER
+
+		# Evaluate argument expressions with the provided argument
+		# 	eg.  A(t+2)  evaluates t+2 with the provided arg for t
+		#
+		# Also uses a random number for 'r', to add a little randomness
+		# to the system
+		rand_max = random_max
+		rand = random.random
 		tokens = []
+		for symbol, argument, arg_func, uses_random in self._tokens:
+			if arg_func != None:
+				r = 0
+				if uses_random:
+					# A single draw covers both size and sign (positive or negative)
+					r = (rand() * 2 - 1) * rand_max
+				argument = int(arg_func(arg, int(r)))
+			tokens.append(Token(symbol, argument))
+		if PRINT_RULE_EXEC:
+			print("Result: {0}".format(tokens))
+		tokens = tuple(tokens)
 
-		token_rule = ""
-		token_argument = None
-		for token in grammar_tokens:
-			if parser == GRAMMAR_IDENTIFIER or token.isdigit() == False:
-				if token_rule != "":
-					tokens.append(Token(token_rule, token_argument))
-				token_rule = token
-				token_argument = None
-				parser = GRAMMAR_ARGUMENT
-			elif parser == GRAMMAR_ARGUMENT:
-				if token_argument == None:
-					token_argument = 0
-				token_argument = token_argument * 10 + int(token)
-		tokens.append(Token(token_rule, token_argument))
-
-		operators = []
-		for token in tokens:
-			token_ops = token.execute(depth+1)
-			for operator in token_ops:
-				operators.append(operator)
+		if self._deterministic:
+			self._memo[arg] = tokens
+		return tokens
+
+# Rotation operators, and the (axis, direction) they rotate around
+_ROTATIONS = {
+	'+':  (2,  1), # turn (right) around Z-axis
+	'-':  (2, -1), # turn (left)  around Z-axis
+	'&':  (0,  1), # pitch (down) around X-axis
+	'^':  (0, -1), # pitch (up)   around X-axis
+	'/':  (1,  1), # yaw (right)  around Y-axis
+	'\\': (1, -1), # yaw (left)   around Y-axis
+}
 
-		return operators
+_DEG2RAD = math.pi / 180
 
 # Operator
 # ########
@@ -292,6 +343,8 @@ class Rule:
 # changing the current direction, or drawing operations (leaves, flowers)
 #######################
 class Operator:
+	__slots__ = ('op', 'arg')
+
 	def __init__(self, op, arg):
 		self.op  = op
 		self.arg = arg
@@ -300,138 +353,75 @@ class Operator:
 	def __repr__(self):
 		return "Operator [{0}]: {1}".format(self.op, self.arg)
 
-	def execute(self):
-		global states, curve, grow_step, grow_radius, grow_angle, plant
-		global DRAW_LEAVES, DRAW_FLOWERS
-		global PRINT_DRAWING
+	def execute(self, ctx):
+		states = ctx.states
 
 		if self.op == '[':
 			# Push State
 			newState = State()
-			newState.position = states[0].position
-			newState.orientation = states[0].orientation
-			states.insert(0, newState)
+			newState.position = list(states[-1].position)
+			newState.orientation = list(states[-1].orientation)
+			states.append(newState)
 
 			# Initialize spline
-			newState.spline.points[0].co = newState.position
-			newState.spline.points[0].radius = grow_radius
-			if PRINT_DRAWING:
-				print(newState.spline.points)
+			newState.add_point(ctx.radius)
+			if ctx.print_drawing:
+				print(newState._pending)
 		elif self.op == ']':
 			# Pop State
-			# NOTE: spline is attached to curve, so when this state is deleted the spline still exists
-			del states[0]
-		elif self.op == '+':
-			# Rotate + (turn) around Z
-			angle = grow_angle
-			if self.arg != None:
-				angle = int(self.arg)
-			orientation = list(states[0].orientation)
-			orientation[2] = orientation[2] + angle % 360
-			states[0].orientation = tuple(orientation)
-		elif self.op == '-':
-			# Rotate - (turn) around Z (negative)
-			angle = -grow_angle
-			if self.arg != None:
-				angle = -int(self.arg)
-			orientation = list(states[0].orientation)
-			orientation[2] = orientation[2] + angle % 360
-			states[0].orientation = tuple(orientation)
-		elif self.op == '&':
-			# Rotate & (pitch) around X
-			angle = grow_angle
+			# NOTE: the branch is kept around to be drawn, after this state is deleted
+			ctx.branches.append(states.pop()._pending)
+		elif self.op in _ROTATIONS:
+			# Rotate around the given axis
+			axis, sign = _ROTATIONS[self.op]
+			angle = ctx.angle
 			if self.arg != None:
 				angle = int(self.arg)
-			orientation = list(states[0].orientation)
-			orientation[0] = orientation[0] + angle % 360
-			states[0].orientation = tuple(orientation)
-		elif self.op == '^':
-			# Rotate ^ (pitch) around X
-			angle = -grow_angle
-			if self.arg != None:
-				angle = -int(self.arg)
-			orientation = list(states[0].orientation)
-			orientation[0] = orientation[0] + angle % 360
-			states[0].orientation = tuple(orientation)
-		elif self.op == '/':
-			# Rotate / (yaw) around Y
-			angle = grow_angle
-			if self.arg != None:
-				angle = int(self.arg)
-			orientation = list(states[0].orientation)
-			orientation[1] = orientation[1] + angle % 360
-			states[0].orientation = tuple(orientation)
-		elif self.op == '\\':
-			# Rotate \ (yaw) around Y
-			angle = -grow_angle
-			if self.arg != None:
-				angle = -int(self.arg)
-			orientation = list(states[0].orientation)
-			orientation[1] = orientation[1] + angle % 360
-			states[0].orientation = tuple(orientation)
+			states[-1].orientation[axis] += sign * angle % 360
 		elif self.op == 'F':
 			# Move forward (default step length)
-			step = grow_step
+			step = ctx.step
 			if self.arg != None:
-				step = int(self.arg)
-			position = list(states[0].position)
-			orientation = list(states[0].orientation)
-			position[0] = position[0] + step * math.cos( orientation[0] * math.pi / 180 )
-			position[1] = position[1] + step * math.sin( orientation[1] * math.pi / 180 )
-			position[2] = position[2] + step * math.cos( orientation[2] * math.pi / 180 )
-			states[0].position = tuple(position)
-			states[0].spline.points.add(1)
-			states[0].spline.points[-1].co = states[0].position
-			states[0].spline.points[-1].radius = grow_radius
-			if PRINT_DRAWING:
-				print("Added Point <{0}>".format(states[0].position))
-				print(states[0].spline.points)
+				step = self.arg
+			cos = math.cos
+			sin = math.sin
+			position = states[-1].position
+			orientation = states[-1].orientation
+			position[0] += step * cos( orientation[0] * _DEG2RAD )
+			position[1] += step * sin( orientation[1] * _DEG2RAD )
+			position[2] += step * cos( orientation[2] * _DEG2RAD )
+			states[-1].add_point(ctx.radius)
+			if ctx.print_drawing:
+				print("Added Point <{0}>".format(states[-1].position))
+				print(states[-1]._pending)
 				print("Draw..")
 		elif self.op == 'L':
 			# Draw Leaf
-			if DRAW_LEAVES:
-				position = list(states[0].position)
-				position.pop()
-
-				mesh = bpy.data.meshes.new("Tri")
-				p1 = [0,0,0]
-				p2 = [0,0,0]
-				p3 = [0,0,0]
+			# NOTE: leaves are only collected here; they're all built into a
+			# single mesh once the plant is finished
+			if ctx.draw_leaves:
+				x, y, z = states[-1].position
+				rand = random.random
 				leaf_len = 0.04
 				raise_len = 0.1
-				p1[0] = -leaf_len + position[0]
-				p1[1] = -leaf_len + position[1]
-				p1[2] = position[2] + random.random()*raise_len
-
-				p2[0] = leaf_len + position[0]
-				p2[1] = -leaf_len + position[1]
-				p2[2] = position[2] + random.random()*raise_len
-
-				p3[0] = position[0]
-				p3[1] = leaf_len + position[1]
-				p3[2] = position[2] + random.random()*raise_len
-
-				p1 = tuple(p1)
-				p2 = tuple(p2)
-				p3 = tuple(p3)
-				mesh.from_pydata([p1,p2,p3], [], [(0,1,2)])
-				mesh.update()
-				ob = bpy.data.objects.new("Tri", mesh)
-				ob.data = mesh
-				bpy.context.scene.objects.link(ob)
-				ob.parent = plant
-
-				if PRINT_DRAWING:
+				p1 = (-leaf_len + x, -leaf_len + y, z + rand()*raise_len)
+				p2 = ( leaf_len + x, -leaf_len + y, z + rand()*raise_len)
+				p3 = (x, leaf_len + y, z + rand()*raise_len)
+
+				base = len(ctx.leaf_verts)
+				ctx.leaf_verts.extend((p1, p2, p3))
+				ctx.leaf_faces.append((base, base+1, base+2))
+
+				if ctx.print_drawing:
 					print("Drawing Leaf: {0}, {1}, {2}".format(p1,p2,p3))
 		elif self.op == 'K':
 			# Draw Flower
-			if DRAW_FLOWERS:
-				position = list(states[0].position)
-				bpy.ops.mesh.primitive_uv_sphere_add(size=0.01, location=(position[0], position[1], position[2]))
-				bpy.context.object.parent = plant
-				
+			# NOTE: flowers are only collected here, and drawn once the plant is finished
+			if ctx.draw_flowers:
+				position = tuple(states[-1].position)
+				ctx.flowers.append(position)
 
-				if PRINT_DRAWING:
+				if ctx.print_drawing:
 					print("Draw Flower at <{0}, {1}, {2}>".format(position[0], position[1], position[2]))
 		elif self.op == '!':
 			# Set radius
@@ -440,6 +430,16 @@ class Operator:
 			print("Unknown Operator: {0}".format(self.op))
 
 
+# Generator specifications, and the (global variable, description) they set
+_SPECS = {
+	"STEP":     ("grow_step",      "Grow Step"),
+	"RADIUS":   ("grow_radius",    "Radius"),
+	"ANGLE":    ("grow_angle",     "Angle"),
+	"RANDOM":   ("random_max",     "Max Random"),
+	"MAXDEPTH": ("MAX_DEPTH",      "Max Depth"),
+	"MAXOPS":   ("MAX_OPERATIONS", "Max Operations"),
+}
+
 # Generator
 # #########
 #
@@ -460,8 +460,7 @@ class Generator(bpy.types.Operator):
 		return True
 
 	def execute(self, context):
-		global states, rules, curve, derivations, operations, plant
-		global grow_step, grow_radius, grow_angle, random_max, MAX_DEPTH, MAX_OPERATIONS
+		global rules, derivations, operations
 		global PRINT_SPECS
 
 		context.space_data.show_relationship_lines = False
@@ -472,8 +471,7 @@ class Generator(bpy.types.Operator):
 		curve.bevel_depth = 1
 		curve.fill_mode = 'FULL'
 		curve.resolution_u = 4
-		states = [State()]
-		rules  = []
+		rules  = {}
 		operations = 0
 		derivations = 0
 
@@ -575,62 +573,14 @@ class Generator(bpy.types.Operator):
 			specs = first_line.strip().split(' ')
 			del specs[0]
 
-			SPEC_PARSE_KEY = 1
-			SPEC_PARSE_VAL = 2
-			SPEC_STEP      = 1
-			SPEC_RADIUS    = 2
-			SPEC_ANGLE     = 3
-			SPEC_RANDOM    = 4
-			SPEC_MAXDEPTH  = 5
-			SPEC_MAXOPS    = 6
-
-			spec_parsing = SPEC_PARSE_KEY
-			parse_key = None
-			for token in specs:
-				if spec_parsing == SPEC_PARSE_KEY:
-					if token == "STEP":
-						parse_key = SPEC_STEP
-					elif token == "RADIUS":
-						parse_key = SPEC_RADIUS
-					elif token == "ANGLE":
-						parse_key = SPEC_ANGLE
-					elif token == "RANDOM":
-						parse_key = SPEC_RANDOM
-					elif token == "MAXDEPTH":
-						parse_key = SPEC_MAXDEPTH
-					elif token == "MAXOPS":
-						parse_key = SPEC_MAXOPS
-					else:
-						parse_key = None
-					spec_parsing = SPEC_PARSE_VAL
-				elif spec_parsing == SPEC_PARSE_VAL:
-					val = float(token)
-					if parse_key == SPEC_STEP:
-						if PRINT_SPECS:
-							print("Grow Step: {0}".format(str(val)))
-						grow_step = val
-					elif parse_key == SPEC_RADIUS:
-						if PRINT_SPECS:
-							print("Radius: {0}".format(str(val)))
-						grow_radius = val
-					elif parse_key == SPEC_ANGLE:
-						if PRINT_SPECS:
-							print("Angle: {0}".format(str(val)))
-						grow_angle = val
-					elif parse_key == SPEC_RANDOM:
-						if PRINT_SPECS:
-							print("Max Random: {0}".format(str(val)))
-						random_max = val
-					elif parse_key == SPEC_MAXDEPTH:
-						if PRINT_SPECS:
-							print("Max Depth: {0}".format(str(val)))
-						MAX_DEPTH = val
-					elif parse_key == SPEC_MAXOPS:
-						if PRINT_SPECS:
-							print("Max Operations: {0}".format(str(val)))
-						MAX_OPERATIONS = val
-					parse_key = None
-					spec_parsing = SPEC_PARSE_KEY
+			for key, val in zip(specs[::2], specs[1::2]):
+				if key not in _SPECS:
+					continue
+				name, label = _SPECS[key]
+				val = float(val)
+				if PRINT_SPECS:
+					print("{0}: {1}".format(label, str(val)))
+				globals()[name] = val
 			del generator_desc[0]
 
 		# Go through each line of the L-System; parse the rule and add it to the list of rules
@@ -639,20 +589,125 @@ class Generator(bpy.types.Operator):
 			if rule.identifier == None:
 				self.axiom = rule
 			else:
-				rules.append(rule)
+				rules.setdefault(rule.identifier, []).append(rule)
 
 		# Draw the curve
 		plant = bpy.data.objects.new("Plant", curve)
 		bpy.context.scene.objects.link(plant)
 
 		# Execute the Axiom
-		operators = self.axiom.execute(0,0)
-		for operator in operators:
-			operator.execute()
-
-		print("Operators: {0}".format(len(operators)))
+		ctx = _Ctx(curve, plant)
+		ctx.states[0].add_point(ctx.radius)
+		num_operators = 0
+		for operator in self._derive(self.axiom):
+			operator.execute(ctx)
+			num_operators += 1
+		self._draw(ctx)
+
+		print("Operators: {0}".format(num_operators))
 		return {'FINISHED'}
 
+	# Draw the plant from everything collected while executing the operators
+	#
+	# This is the only part of drawing which touches Blender, so that each of
+	# the splines, leaves and flowers can be created in bulk
+	def _draw(self, ctx):
+		# Finish any branches left open (eg. from hitting the operations limit)
+		for state in ctx.states:
+			ctx.branches.append(state._pending)
+
+		# Draw the branches
+		for branch in ctx.branches:
+			if not branch:
+				continue
+
+			# New splines already come with a single point
+			spline = ctx.curve.splines.new(type='POLY')
+			spline.points.add(len(branch) - 1)
+			co     = []
+			radius = []
+			for point in branch:
+				co.extend(point[:4])
+				radius.append(point[4])
+			spline.points.foreach_set("co", co)
+			spline.points.foreach_set("radius", radius)
+
+		# Draw the leaves
+		if ctx.leaf_faces:
+			mesh = bpy.data.meshes.new("Leaves")
+			mesh.from_pydata(ctx.leaf_verts, [], ctx.leaf_faces)
+			mesh.update()
+			leaves = bpy.data.objects.new("Leaves", mesh)
+			bpy.context.scene.objects.link(leaves)
+			leaves.parent = ctx.plant
+
+		# Draw the flowers
+		# NOTE: every flower shares the same sphere mesh; the sphere is only
+		# made once through bpy.ops (which is slow), then the object it was
+		# added with is thrown away
+		if ctx.flowers:
+			bpy.ops.mesh.primitive_uv_sphere_add(size=0.01, location=(0.0, 0.0, 0.0))
+			sphere = bpy.context.object
+			flower_mesh = sphere.data
+			bpy.context.scene.objects.unlink(sphere)
+			bpy.data.objects.remove(sphere)
+
+			for position in ctx.flowers:
+				flower = bpy.data.objects.new("Flower", flower_mesh)
+				flower.location = position
+				bpy.context.scene.objects.link(flower)
+				flower.parent = ctx.plant
+
+	# Derive the axiom down into Operators, yielded one at a time
+	#
+	# Tokens are worked through depth-first from an explicit stack (rather
+	# than recursing through each rule), so the operators come out in the
+	# same order as the grammar would be read. Operators are streamed out
+	# as they're derived, rather than holding onto all of them at once
+	def _derive(self, axiom):
+		global operations, grow_step
+		global MAX_OPERATIONS, MAX_DEPTH
+
+		forward    = None # Step forward being held back to fuse with any following steps
+		work_stack = [(token, 1) for token in reversed(axiom.expand(0))]
+		while work_stack:
+			token, depth = work_stack.pop()
+			if operations >= MAX_OPERATIONS:
+				if PRINT_LIMIT:
+					print("Max Operations: {0} >= {1}".format(str(operations), str(MAX_OPERATIONS)))
+				break
+			if depth > MAX_DEPTH:
+				if PRINT_LIMIT:
+					print("Max Depth: {0} >= {1}".format(str(depth), str(MAX_DEPTH)))
+				continue
+
+			if token._is_op:
+				operations = operations + 1
+				if token.rule == 'F':
+					# Consecutive steps forward are along the same direction, so
+					# they can be fused into a single (longer) step
+					if forward == None:
+						forward = Operator(token.rule, token.param)
+						continue
+					step = token.param
+					if step == None:
+						step = grow_step
+					if forward.arg == None:
+						forward.arg = grow_step
+					forward.arg += step
+					continue
+				if forward != None:
+					yield forward
+					forward = None
+				yield Operator(token.rule, token.param)
+			else:
+				# Each rule adds two levels of depth (token -> rule -> token)
+				for derived in reversed(token.derive()):
+					work_stack.append((derived, depth+2))
+
+		if forward != None:
+			yield forward
+
 	def __repr__(self):
 		return "The Generator"
 